@@ -14,6 +14,7 @@ import argparse
 import json
 import logging
 import sys
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -35,6 +36,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Simplified 6 x 4 grid over the Philippines used for the bin bounds
+GRID_MIN_LON = 116.0
+GRID_MIN_LAT = 2.0
+GRID_COLS = 4
+GRID_LAT_STEP = 20.0 / 6  # 6 rows
+GRID_LON_STEP = 13.0 / 4  # 4 columns
+
 class PredictionGenerator:
     """Generates earthquake predictions using the ML forecasting system."""
     
@@ -65,7 +73,13 @@ class PredictionGenerator:
             
             # Load the processed earthquake data directly
             if self.data_path.suffix == '.csv':
-                df = pd.read_csv(self.data_path)
+                # Only these columns are used downstream; the target_* columns
+                # are skipped at parse time. Values stay float64 so the rounded
+                # magnitudes serialise unchanged in the predictions JSON.
+                df = pd.read_csv(
+                    self.data_path,
+                    usecols=lambda col: col in ('bin_id', 'frequency', 'max_magnitude')
+                )
                 logger.info(f"Loaded {len(df)} records from {self.data_path}")
             else:
                 raise ValueError(f"Unsupported file format: {self.data_path.suffix}")
@@ -88,10 +102,13 @@ class PredictionGenerator:
             
             logger.info(f"Using bins: {valid_bins}")
             
+            # Bucket the rows by bin once instead of filtering the frame per bin
+            rows_by_bin = dict(tuple(df.groupby('bin_id', sort=False)))
+            
             # Create bin data structure for exactly 24 bins
             bins = []
             for i, bin_id in enumerate(valid_bins):
-                bin_data = df[df['bin_id'] == bin_id]
+                bin_data = rows_by_bin[bin_id]
                 
                 # Calculate statistics for this bin
                 # The data has multiple rows per bin (different time periods)
@@ -101,21 +118,18 @@ class PredictionGenerator:
                 
                 # Create realistic bounds for each bin (divide Philippines into 24 regions)
                 # This is a simplified approach - in reality, you'd use the actual quadtree bounds
-                lat_step = 20.0 / 6  # 6 rows
-                lon_step = 13.0 / 4  # 4 columns
-                
-                row = i // 4  # 0-5
-                col = i % 4   # 0-3
+                row = i // GRID_COLS  # 0-5
+                col = i % GRID_COLS   # 0-3
                 
-                min_lon = 116.0 + col * lon_step
-                max_lon = 116.0 + (col + 1) * lon_step
-                min_lat = 2.0 + row * lat_step
-                max_lat = 2.0 + (row + 1) * lat_step
+                min_lon = GRID_MIN_LON + col * GRID_LON_STEP
+                max_lon = GRID_MIN_LON + (col + 1) * GRID_LON_STEP
+                min_lat = GRID_MIN_LAT + row * GRID_LAT_STEP
+                max_lat = GRID_MIN_LAT + (row + 1) * GRID_LAT_STEP
                 
                 bin_info = {
                     'bin_id': int(bin_id),
                     'bounds': [min_lon, max_lon, min_lat, max_lat],
-                    'events': bin_data.to_dict('records'),
+                    'events': bin_data,
                     'earthquake_count': earthquake_count,
                     'max_magnitude': max_magnitude
                 }
@@ -129,66 +143,109 @@ class PredictionGenerator:
             logger.error(f"Failed to generate spatial bins: {e}")
             raise
     
-    def generate_predictions_for_year(self, year: int, bins: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def compute_historical_statistics(self, bins: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Reduce each bin's processed rows to its historical frequency and max magnitude.
+        
+        The result only depends on the bins, so it can be computed once and
+        shared by every prediction year. The has_* arrays mark bins that
+        actually had the column (others report 0).
+        """
+        n_bins = len(bins)
+        # Keep the frequency column's own dtype so integer counts are reported as ints
+        frequency_dtypes = [bin_data['events']['frequency'].dtype for bin_data in bins
+                            if bin_data.get('events') is not None and 'frequency' in bin_data['events'].columns]
+        historical = {
+            'frequency': np.zeros(n_bins, dtype=np.result_type(*frequency_dtypes) if frequency_dtypes else float),
+            'max_magnitude': np.zeros(n_bins),
+            'has_frequency': np.zeros(n_bins, dtype=bool),
+            'has_max_magnitude': np.zeros(n_bins, dtype=bool)
+        }
+        
+        for i, bin_data in enumerate(bins):
+            events = bin_data.get('events')
+            if events is not None and not events.empty:
+                # The events are the bin's rows of the processed CSV; reduce the
+                # columns directly instead of going through per-row dicts
+                if 'frequency' in events.columns:
+                    historical['frequency'][i] = events['frequency'].sum()
+                    historical['has_frequency'][i] = True
+                if 'max_magnitude' in events.columns:
+                    historical['max_magnitude'][i] = events['max_magnitude'].max()
+                    historical['has_max_magnitude'][i] = True
+        
+        return historical
+    
+    def generate_predictions_for_year(self, year: int, bins: List[Dict[str, Any]],
+                                      historical: Dict[str, Any] = None,
+                                      generated_at: str = None) -> Dict[str, Any]:
         """Generate predictions for a specific year and spatial bins.
         
         This is a simplified prediction that uses historical data patterns.
         In a full implementation, this would run the actual ML models.
+        Pass ``historical`` from compute_historical_statistics to reuse it across years,
+        and ``generated_at`` to stamp every year of a run with the same timestamp.
+        """
+        return self.generate_predictions_for_years([year], bins, historical, generated_at)[0]
+    
+    def generate_predictions_for_years(self, years: List[int], bins: List[Dict[str, Any]],
+                                       historical: Dict[str, Any] = None,
+                                       generated_at: str = None) -> List[Dict[str, Any]]:
+        """Generate predictions for several years in one batch.
+        
+        The model runs once over all bins and its outputs are shared by every
+        year; only the per-year prediction structures are built per year.
         """
         try:
-            logger.info(f"Generating predictions for year {year}...")
+            # Historical statistics from the processed data, one entry per bin
+            if historical is None:
+                historical = self.compute_historical_statistics(bins)
+            historical_frequency = historical['frequency']
+            historical_max_magnitude = historical['max_magnitude']
+            has_frequency = historical['has_frequency']
+            has_max_magnitude = historical['has_max_magnitude']
+            
+            # Simple prediction model (placeholder for actual ML), applied to all bins at once
+            # In reality, this would run the LSTM models
+            predicted_frequency = np.maximum(0, (historical_frequency * 1.1).astype(int))  # 10% increase
+            has_magnitude_signal = historical_max_magnitude > 0
+            predicted_max_magnitude = np.round(historical_max_magnitude + 0.1, 2)
+            historical_max_magnitude_rounded = np.round(historical_max_magnitude, 2)
             
-            predictions = []
+            if generated_at is None:
+                generated_at = datetime.utcnow().isoformat() + "Z"
             
-            for bin_data in bins:
-                # Extract bin information
-                bin_id = bin_data.get('bin_id', 0)
-                bounds = bin_data.get('bounds', [])
-                events = bin_data.get('events', [])
+            all_predictions = []
+            for year in years:
+                logger.info(f"Generating predictions for year {year}...")
                 
-                # Calculate historical statistics from the processed data
-                if events:
-                    # The events contain the processed CSV data
-                    frequencies = [event.get('frequency', 0) for event in events]
-                    magnitudes = [event.get('max_magnitude', 0) for event in events]
-                    
-                    # Sum frequencies and get max magnitude
-                    earthquake_frequency = sum(frequencies)
-                    max_magnitude = max(magnitudes) if magnitudes else 0
-                else:
-                    earthquake_frequency = 0
-                    max_magnitude = 0
+                # Materialise the per-bin records only at the edge
+                predictions = [
+                    {
+                        "bin_id": bin_data.get('bin_id', 0),
+                        "bounds": bin_data.get('bounds', []),
+                        "earthquake_frequency": int(predicted_frequency[i]),
+                        "max_magnitude": float(predicted_max_magnitude[i]) if has_magnitude_signal[i] else 0,
+                        "historical_frequency": historical_frequency[i].item() if has_frequency[i] else 0,
+                        "historical_max_magnitude": float(historical_max_magnitude_rounded[i]) if has_max_magnitude[i] else 0,
+                        "confidence": 0.85  # Placeholder confidence score
+                    }
+                    for i, bin_data in enumerate(bins)
+                ]
                 
-                # Simple prediction model (placeholder for actual ML)
-                # In reality, this would run the LSTM models
-                predicted_frequency = max(0, int(earthquake_frequency * 1.1))  # 10% increase
-                predicted_max_magnitude = max_magnitude + 0.1 if max_magnitude > 0 else 0
+                # Create the complete prediction structure
+                all_predictions.append({
+                    "year": year,
+                    "generated_at": generated_at,
+                    "total_bins": len(predictions),
+                    "predictions": predictions
+                })
                 
-                prediction = {
-                    "bin_id": bin_id,
-                    "bounds": bounds,
-                    "earthquake_frequency": predicted_frequency,
-                    "max_magnitude": round(predicted_max_magnitude, 2),
-                    "historical_frequency": earthquake_frequency,
-                    "historical_max_magnitude": round(max_magnitude, 2),
-                    "confidence": 0.85  # Placeholder confidence score
-                }
-                
-                predictions.append(prediction)
-            
-            # Create the complete prediction structure
-            prediction_data = {
-                "year": year,
-                "generated_at": datetime.utcnow().isoformat() + "Z",
-                "total_bins": len(predictions),
-                "predictions": predictions
-            }
+                logger.info(f"Generated predictions for {len(predictions)} bins in year {year}")
             
-            logger.info(f"Generated predictions for {len(predictions)} bins in year {year}")
-            return prediction_data
+            return all_predictions
             
         except Exception as e:
-            logger.error(f"Failed to generate predictions for year {year}: {e}")
+            logger.error(f"Failed to generate predictions for years {years}: {e}")
             raise
     
     def save_predictions(self, predictions: Dict[str, Any], year: int) -> Path:
@@ -218,10 +275,15 @@ class PredictionGenerator:
             # Generate spatial bins
             bins = self.generate_spatial_bins(df)
             
-            # Generate predictions for each year
+            # Historical statistics don't depend on the year; compute them once,
+            # and stamp the whole run with a single timestamp
+            historical = self.compute_historical_statistics(bins)
+            generated_at = datetime.utcnow().isoformat() + "Z"
+            
+            # Generate predictions for all years in one batch, then save each year
             saved_files = []
-            for year in years:
-                predictions = self.generate_predictions_for_year(year, bins)
+            all_predictions = self.generate_predictions_for_years(years, bins, historical, generated_at)
+            for year, predictions in zip(years, all_predictions):
                 filepath = self.save_predictions(predictions, year)
                 saved_files.append(filepath)
             
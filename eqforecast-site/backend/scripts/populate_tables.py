@@ -7,7 +7,7 @@ from supabase import create_client, Client
 import os
 import uuid
 from datetime import datetime
-import random
+import numpy as np
 
 # --- CONFIG: Supabase connection ---
 SUPABASE_URL = "https://rettsbvizhuvyvmiiyed.supabase.co"
@@ -16,24 +16,32 @@ SUPABASE_KEY = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJpc3MiOiJzdXBhYmFzZSIsInJ
 # Initialize Supabase client
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
+# Static sample-forecast layout, built once at import
+FORECAST_MODELS = ("LSTM_v1", "LSTM_v2", "Attention_LSTM", "Enhanced_LSTM")
+FORECAST_BIN_IDS = tuple(f"B{i}" for i in range(24))  # B0, B1, B2, ..., B23
+
 def create_all_bins():
     """Create all 24 bins from B0 to B23"""
     print("🗺️  Creating all 24 bins from B0 to B23...")
     
     bins_data = []
     
-    for i in range(24):  # 0 to 23
-        # Generate realistic coordinates around California
-        lat = 32.0 + (i * 0.2)  # Spread latitudes from 32.0 to 36.6
-        lon = -116.0 + (i * 0.15)  # Spread longitudes from -116.0 to -112.4
-        area = 750.0 + (i * 50)  # Vary areas from 750 to 1900
-        
+    # Generate realistic coordinates around California for all bins at once
+    bin_index = np.arange(24)  # 0 to 23
+    lats = 32.0 + (bin_index * 0.2)  # Spread latitudes from 32.0 to 36.6
+    lons = -116.0 + (bin_index * 0.15)  # Spread longitudes from -116.0 to -112.4
+    areas = 750.0 + (bin_index * 50.0)  # Vary areas from 750 to 1900
+    
+    # One timestamp for the whole batch, since it is a single insert
+    created_at = datetime.utcnow().isoformat()
+    
+    for i, lat, lon, area in zip(bin_index.tolist(), lats.tolist(), lons.tolist(), areas.tolist()):
         bin_data = {
             "id": f"B{i}",
             "center_lat": round(lat, 1),
             "center_lon": round(lon, 1),
             "area": area,
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": created_at
         }
         bins_data.append(bin_data)
         print(f"   📍 Creating bin B{i}: ({lat}, {lon}) - area: {area}")
@@ -52,18 +60,26 @@ def populate_annual_forecasts_2025():
     print("🔮 Creating forecasts for all 24 bins in 2025...")
     
     # Sample forecast data for 2025 only
-    models = ["LSTM_v1", "LSTM_v2", "Attention_LSTM", "Enhanced_LSTM"]
-    bin_ids = [f"B{i}" for i in range(24)]  # B0, B1, B2, ..., B23
+    models = FORECAST_MODELS
+    bin_ids = FORECAST_BIN_IDS
     
     # Debug: Show what we're creating
     print(f"📊 Creating forecasts for:")
-    print(f"   - Models: {models}")
-    print(f"   - Bins: {bin_ids}")
+    print(f"   - Models: {list(models)}")
+    print(f"   - Bins: {list(bin_ids)}")
     print(f"   - Year: 2025")
     print(f"   - Total forecasts to create: {len(bin_ids)}")
     
     forecasts_data = []
     
+    # Draw every bin's sample forecast values in one call per column
+    rng = np.random.default_rng()
+    pred_frequencies = np.round(rng.uniform(2.0, 8.0, len(bin_ids)), 2).tolist()
+    pred_max_magnitudes = np.round(rng.uniform(5.0, 7.5, len(bin_ids)), 1).tolist()
+    
+    # One timestamp for the whole batch, since it is a single insert
+    created_at = datetime.utcnow().isoformat()
+    
     for i, bin_id in enumerate(bin_ids):
         # Use a different model for each bin to create variety
         model = models[i % len(models)]
@@ -72,10 +88,10 @@ def populate_annual_forecasts_2025():
             "model_name": model,
             "bin_id": bin_id,
             "year": 2025,
-            "pred_frequency": round(random.uniform(2.0, 8.0), 2),
-            "pred_max_magnitude": round(random.uniform(5.0, 7.5), 1),
+            "pred_frequency": pred_frequencies[i],
+            "pred_max_magnitude": pred_max_magnitudes[i],
             "run_id": f"run_{model}_2025_{bin_id}",
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": created_at
         }
         forecasts_data.append(forecast)
         print(f"   📝 Created forecast: {model} for {bin_id} in 2025")
@@ -11,6 +11,29 @@ import os
 from pathlib import Path
 import torch
 
+# Configuration files written by the hyperparameter tuning notebook, by name
+OPTIMIZED_CONFIG_FILES = {
+    "best_frequency": "best_frequency_config.json",
+    "best_magnitude": "best_magnitude_config.json",
+    "best_balanced": "best_balanced_config.json",
+    "anti_overfitting": "anti_overfitting_config.json",
+    "balanced_anti_overfitting": "balanced_anti_overfitting_config.json",
+    "enhanced_frequency_scaling": "enhanced_frequency_scaling_config.json",
+    "high_performance_balanced": "high_performance_balanced_config.json"
+}
+CONFIG_FILES = tuple(OPTIMIZED_CONFIG_FILES.values())
+
+# Which configuration to pick for which goal
+CONFIG_RECOMMENDATIONS = (
+    "Use 'Best Frequency Prediction' if frequency accuracy is priority",
+    "Use 'Best Magnitude Prediction' if magnitude accuracy is priority",
+    "Use 'Best Balanced Performance' for production deployment",
+    "Use 'Anti-Overfitting Configuration' to prevent overfitting and ensure generalization",
+    "Use 'Balanced Anti-Overfitting Configuration' for balanced performance and capacity",
+    "Use 'Enhanced Frequency Scaling Configuration' for maximum range coverage",
+    "Use 'High Performance Balanced Configuration' for maximum overall performance"
+)
+
 def load_config(config_file: str) -> dict:
     """Load a configuration file."""
     with open(config_file, 'r') as f:
@@ -92,18 +115,8 @@ def main():
     print("=" * 60)
     
     # Check if config files exist
-    config_files = [
-        'best_frequency_config.json',
-        'best_magnitude_config.json', 
-        'best_balanced_config.json',
-        'anti_overfitting_config.json',
-        'balanced_anti_overfitting_config.json',
-        'enhanced_frequency_scaling_config.json',
-        'high_performance_balanced_config.json'
-    ]
-    
     available_configs = {}
-    for config_file in config_files:
+    for config_file in CONFIG_FILES:
         if os.path.exists(config_file):
             config = load_config(config_file)
             available_configs[config['name']] = config
@@ -154,13 +167,8 @@ def main():
             print(f"  Combined score: {perf['combined_score']:.2f}")
     
     print("\nRecommendations:")
-    print("  • Use 'Best Frequency Prediction' if frequency accuracy is priority")
-    print("  • Use 'Best Magnitude Prediction' if magnitude accuracy is priority") 
-    print("  • Use 'Best Balanced Performance' for production deployment")
-    print("  • Use 'Anti-Overfitting Configuration' to prevent overfitting and ensure generalization")
-    print("  • Use 'Balanced Anti-Overfitting Configuration' for balanced performance and capacity")
-    print("  • Use 'Enhanced Frequency Scaling Configuration' for maximum range coverage")
-    print("  • Use 'High Performance Balanced Configuration' for maximum overall performance")
+    for recommendation in CONFIG_RECOMMENDATIONS:
+        print(f"  • {recommendation}")
     
     print("\n🎯 Next Steps:")
     print("  1. Import this script in your main training code")
@@ -2,7 +2,6 @@ import numpy as np
 import pandas as pd
 from csep.core.catalogs import CSEPCatalog
 from csep.core.regions import CartesianGrid2D
-from csep.utils.time_utils import datetime_to_utc_epoch
 
 def apply_cartesian(catalog, n_lat=3, n_lon=3):
     # --- Region bounds ---
@@ -25,15 +24,16 @@ def apply_cartesian(catalog, n_lat=3, n_lon=3):
     lons = catalog.get_longitudes()
     lats = catalog.get_latitudes()
 
-    mask = np.full(len(lons), False)
-    for lon_c, lat_c in origins:
-        in_lon = (lons >= lon_c - dh_lon / 2) & (lons < lon_c + dh_lon / 2)
-        in_lat = (lats >= lat_c - dh_lat / 2) & (lats < lat_c + dh_lat / 2)
-        mask |= (in_lon & in_lat)
+    # Test every event against every cell in one broadcast pass
+    lon_c, lat_c = origins[:, 0], origins[:, 1]
+    in_lon = (lons[:, None] >= lon_c - dh_lon / 2) & (lons[:, None] < lon_c + dh_lon / 2)
+    in_lat = (lats[:, None] >= lat_c - dh_lat / 2) & (lats[:, None] < lat_c + dh_lat / 2)
+    mask = (in_lon & in_lat).any(axis=1)
 
     filtered_mags = catalog.get_magnitudes()[mask]
     filtered_depths = catalog.get_depths()[mask] if catalog.get_depths() is not None else np.full(np.sum(mask), np.nan)
-    filtered_times = [datetime_to_utc_epoch(dt) for dt in np.array(catalog.get_datetimes())[mask]]
+    # Epoch times are stored on the catalog already; no datetime round-trip
+    filtered_times = catalog.get_epoch_times()[mask]
 
     df = pd.DataFrame({
         'id': np.arange(np.sum(mask)),
@@ -1,10 +1,6 @@
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import cartopy.crs as ccrs
-import cartopy.feature as cfeature
 from csep.core.catalogs import CSEPCatalog
-from csep.utils.time_utils import datetime_to_utc_epoch
 from csep.core.regions import CartesianGrid2D
 from typing import List, Tuple
 
@@ -67,6 +63,15 @@ def count_events_in_bin(bounds, lons, lats):
     )
     return np.sum(mask)
 
+def count_events_in_bins(bounds, lons, lats):
+    """Count events in every bin at once; returns an array aligned with bounds."""
+    bounds_arr = np.asarray(bounds, dtype=float).reshape(-1, 4)
+    in_bin = (
+        (lons[:, None] >= bounds_arr[:, 0]) & (lons[:, None] < bounds_arr[:, 1]) &
+        (lats[:, None] >= bounds_arr[:, 2]) & (lats[:, None] < bounds_arr[:, 3])
+    )
+    return in_bin.sum(axis=0)
+
 def are_bins_adjacent(bin1, bin2, tolerance=1e-6):
     """Check if two bins are adjacent (share edges)."""
     lon_adjacent = (
@@ -108,7 +113,7 @@ def merge_adjacent_bins(bounds, lons, lats, threshold=50, max_bin_size=10.0):
     print(f"🔄 Starting merge process with {len(bounds)} bins, threshold: {threshold}")
     
     # Count events in each bin
-    bin_counts = {b: count_events_in_bin(b, lons, lats) for b in bounds}
+    bin_counts = dict(zip(bounds, count_events_in_bins(bounds, lons, lats)))
     
     # Find bins below threshold
     low_count_bins = [b for b, count in bin_counts.items() if count < threshold]
@@ -367,17 +372,18 @@ def apply_quadtree_binning(catalog, max_depth=4, min_events=10, merge_threshold=
     else:
         final_bounds = unmerged_bounds
 
+    # Final bins as an (n_bins, 4) array of (min_lon, max_lon, min_lat, max_lat)
+    bounds_arr = np.asarray(final_bounds, dtype=float).reshape(-1, 4)
+
     # Create mask for events in final bins
-    mask = np.full(len(lons), False)
-    for (min_lon, max_lon, min_lat, max_lat) in final_bounds:
-        in_lon = (lons >= min_lon) & (lons < max_lon)
-        in_lat = (lats >= min_lat) & (lats < max_lat)
-        mask |= (in_lon & in_lat)
+    mask = ((lons[:, None] >= bounds_arr[:, 0]) & (lons[:, None] < bounds_arr[:, 1]) &
+            (lats[:, None] >= bounds_arr[:, 2]) & (lats[:, None] < bounds_arr[:, 3])).any(axis=1)
 
     # Create filtered DataFrame
     filtered_mags = catalog.get_magnitudes()[mask]
     filtered_depths = catalog.get_depths()[mask] if catalog.get_depths() is not None else np.full(np.sum(mask), np.nan)
-    filtered_times = [datetime_to_utc_epoch(dt) for dt in np.array(catalog.get_datetimes())[mask]]
+    # Epoch times are stored on the catalog already; no datetime round-trip
+    filtered_times = catalog.get_epoch_times()[mask]
 
     df = pd.DataFrame({
         'id': np.arange(np.sum(mask)),
@@ -389,13 +395,10 @@ def apply_quadtree_binning(catalog, max_depth=4, min_events=10, merge_threshold=
     })
 
     # Create region from bin centers
-    bin_centers = []
-    for (min_lon, max_lon, min_lat, max_lat) in final_bounds:
-        center_lon = (min_lon + max_lon) / 2
-        center_lat = (min_lat + max_lat) / 2
-        bin_centers.append([center_lon, center_lat])
-    
-    bin_centers = np.array(bin_centers)
+    bin_centers = np.column_stack((
+        (bounds_arr[:, 0] + bounds_arr[:, 1]) / 2,
+        (bounds_arr[:, 2] + bounds_arr[:, 3]) / 2
+    ))
     region = CartesianGrid2D.from_origins(bin_centers, dh=1.0)
     filtered_catalog = CSEPCatalog.from_dataframe(df, region=region)
 
@@ -404,6 +407,10 @@ def apply_quadtree_binning(catalog, max_depth=4, min_events=10, merge_threshold=
 def plot_quadtree_comparison(original_catalog, unmerged_bounds, merged_bounds, 
                             merge_threshold=None, save_path=None):
     """Plot both unmerged and merged quadtree grids for comparison."""
+    import matplotlib.pyplot as plt
+    import cartopy.crs as ccrs
+    import cartopy.feature as cfeature
+
     print(f"🎨 Creating quadtree comparison plot...")
     print(f"📊 Unmerged bins: {len(unmerged_bounds)}")
     print(f"📊 Merged bins: {len(merged_bounds)}")
@@ -432,13 +439,14 @@ def plot_quadtree_comparison(original_catalog, unmerged_bounds, merged_bounds,
     ax1.scatter(lons, lats, s=10, color='blue', alpha=0.3, 
                 label='All Events', transform=ccrs.PlateCarree())
     
+    unmerged_counts = count_events_in_bins(unmerged_bounds, lons, lats)
     for i, (min_lon, max_lon, min_lat, max_lat) in enumerate(unmerged_bounds):
         rect = plt.Rectangle((min_lon, min_lat), max_lon - min_lon, max_lat - min_lat,
                            edgecolor='red', facecolor='none', linewidth=1.5,
                              transform=ccrs.PlateCarree())
         ax1.add_patch(rect)
         
-        count = count_events_in_bin((min_lon, max_lon, min_lat, max_lat), lons, lats)
+        count = unmerged_counts[i]
         center_lon = (min_lon + max_lon) / 2
         center_lat = (min_lat + max_lat) / 2
         ax1.text(center_lon, center_lat, str(count), 
@@ -453,13 +461,14 @@ def plot_quadtree_comparison(original_catalog, unmerged_bounds, merged_bounds,
     ax2.scatter(lons, lats, s=10, color='blue', alpha=0.3, 
                 label='All Events', transform=ccrs.PlateCarree())
     
+    merged_counts = count_events_in_bins(merged_bounds, lons, lats)
     for i, (min_lon, max_lon, min_lat, max_lat) in enumerate(merged_bounds):
         rect = plt.Rectangle((min_lon, min_lat), max_lon - min_lon, max_lat - min_lat,
                            edgecolor='green', facecolor='none', linewidth=2,
                            transform=ccrs.PlateCarree())
         ax2.add_patch(rect)
         
-        count = count_events_in_bin((min_lon, max_lon, min_lat, max_lat), lons, lats)
+        count = merged_counts[i]
         center_lon = (min_lon + max_lon) / 2
         center_lat = (min_lat + max_lat) / 2
         ax2.text(center_lon, center_lat, str(count), 
@@ -555,8 +564,9 @@ class QuadtreeBinner:
             # Verify all bins meet threshold
             print("\n🔍 Verifying all bins meet threshold...")
             all_meet_threshold = True
+            merged_counts = count_events_in_bins(merged_bounds, filtered_lons, filtered_lats)
             for i, b in enumerate(merged_bounds):
-                count = count_events_in_bin(b, filtered_lons, filtered_lats)
+                count = merged_counts[i]
                 width = b[1] - b[0]
                 height = b[3] - b[2]
                 
@@ -576,20 +586,25 @@ class QuadtreeBinner:
         
         # Assign bin IDs to original data using the same mask
         bin_ids = np.full(len(lons), -1, dtype=int)
-        
+
         print(f"\nAssigning earthquakes to {len(self.bounds)} non-overlapping bins:")
-        
+
+        # Test every event against every bin in one broadcast pass: (n_events, n_bins)
+        bounds_arr = np.asarray(self.bounds, dtype=float).reshape(-1, 4)
+        in_bin = (
+            (lons[:, None] >= bounds_arr[:, 0]) & (lons[:, None] < bounds_arr[:, 1]) &
+            (lats[:, None] >= bounds_arr[:, 2]) & (lats[:, None] < bounds_arr[:, 3])
+        )
         # Only assign to events within the custom bounds
-        for bin_id, (min_lon, max_lon, min_lat, max_lat) in enumerate(self.bounds):
-            bin_mask = (
-                (lons >= min_lon) & (lons < max_lon) &
-                (lats >= min_lat) & (lats < max_lat)
-            )
-            # Only assign to events that are also in the filtered mask
-            if self.custom_bounds:
-                bin_mask = bin_mask & mask
-            count = np.sum(bin_mask)
-            bin_ids[bin_mask] = bin_id
+        if self.custom_bounds:
+            in_bin &= mask[:, None]
+
+        # On overlap the highest bin index wins, same as assigning bins in order
+        hit = in_bin.any(axis=1)
+        if hit.any():
+            bin_ids[hit] = len(bounds_arr) - 1 - np.argmax(in_bin[hit, ::-1], axis=1)
+
+        for bin_id, count in enumerate(in_bin.sum(axis=0)):
             print(f"  Bin {bin_id}: {count} earthquakes")
         
         unassigned = np.sum(bin_ids == -1)
@@ -847,7 +862,7 @@ def enhanced_merge_adjacent_bins(bounds, lons, lats, threshold=50, max_bin_size=
     print(f"🔄 Starting enhanced merge process with {len(bounds)} bins, threshold: {threshold}")
     
     # Count events in each bin
-    bin_counts = {b: count_events_in_bin(b, lons, lats) for b in bounds}
+    bin_counts = dict(zip(bounds, count_events_in_bins(bounds, lons, lats)))
     
     # Find mergeable groups
     merge_groups = find_mergeable_groups(bounds, bin_counts, threshold, max_bin_size)
@@ -878,8 +893,10 @@ def enhanced_merge_adjacent_bins(bounds, lons, lats, threshold=50, max_bin_size=
         
         print(f"🎯 Result after group merging: {len(bounds)} → {len(working_bounds)} bins")
         bounds = working_bounds
-        # Update bin counts for the new bounds
-        bin_counts = {b: count_events_in_bin(b, lons, lats) for b in bounds}
+        # Update bin counts for the new bounds; untouched bins keep their
+        # cached count, only the merged bins are recounted
+        bin_counts = {b: bin_counts[b] if b in bin_counts else count_events_in_bin(b, lons, lats)
+                      for b in bounds}
     
     # PHASE 2: Specifically target bins below threshold
     bounds = merge_below_threshold_bins(bounds, bin_counts, threshold, max_bin_size)
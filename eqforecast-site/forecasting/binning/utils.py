@@ -35,10 +35,15 @@ def merge_sparse_bins(bounds, catalog, threshold=10):
                     )
                 else:
                     continue
+                # The two bins share a full edge, so the merged count is
+                # just their sum - no need to rescan the catalog
+                new_count = counts[i] + counts[j]
                 bounds.pop(max(i, j))
                 bounds.pop(min(i, j))
                 bounds.append(new_bin)
-                counts = [count_events(b) for b in bounds]
+                counts.pop(max(i, j))
+                counts.pop(min(i, j))
+                counts.append(new_count)
                 merged = True
                 break
             if merged:
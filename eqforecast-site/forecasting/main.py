@@ -32,8 +32,6 @@ import numpy as np
 import pandas as pd
 from datetime import datetime
 from typing import List, Dict, Optional
-import matplotlib.pyplot as plt
-import seaborn as sns
 import json
 
 # Add src to path for imports
@@ -49,7 +47,9 @@ from src.models.model_comparison_trainer import ModelComparisonTrainer
 
 # Import optimized configuration utilities
 try:
-    from apply_optimized_configs import load_config, create_optimized_model, get_training_params, get_all_training_params
+    from apply_optimized_configs import (
+        OPTIMIZED_CONFIG_FILES, load_config, create_optimized_model, get_training_params, get_all_training_params
+    )
     OPTIMIZED_CONFIGS_AVAILABLE = True
 except ImportError:
     OPTIMIZED_CONFIGS_AVAILABLE = False
@@ -76,23 +76,13 @@ def load_optimized_config(config_name: str = "best_frequency") -> Optional[Dict]
     if not OPTIMIZED_CONFIGS_AVAILABLE:
         return None
     
-    config_files = {
-        "best_frequency": "best_frequency_config.json",
-        "best_magnitude": "best_magnitude_config.json", 
-        "best_balanced": "best_balanced_config.json",
-        "anti_overfitting": "anti_overfitting_config.json",
-        "balanced_anti_overfitting": "balanced_anti_overfitting_config.json",
-        "enhanced_frequency_scaling": "enhanced_frequency_scaling_config.json",
-        "high_performance_balanced": "high_performance_balanced_config.json"
-    }
-    
-    if config_name not in config_files:
+    if config_name not in OPTIMIZED_CONFIG_FILES:
         print(f"Unknown config: {config_name}")
-        print(f"Available: {list(config_files.keys())}")
+        print(f"Available: {list(OPTIMIZED_CONFIG_FILES.keys())}")
         return None
     
     try:
-        config = load_config(config_files[config_name])
+        config = load_config(OPTIMIZED_CONFIG_FILES[config_name])
         print(f"Loaded {config['name']} configuration:")
         
         # Handle different config formats
@@ -138,6 +128,13 @@ def setup_logging(log_level: str = "INFO", log_file: str = None) -> logging.Logg
     return logger
 
 
+def metric_to_json(value):
+    """json.dump hook for metric values json can't encode (numpy/torch scalars)."""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 def preprocess_earthquake_data(input_path: str, output_path: str, logger: logging.Logger) -> pd.DataFrame:
     """
     Preprocess earthquake catalog data following the paper's methodology.
@@ -260,9 +257,7 @@ def create_shared_lstm_datasets(data_path: str,
         train_loader = torch.utils.data.DataLoader(
             dataset, 
             batch_size=16,  # Use your working batch size
-            sampler=torch.utils.data.SubsetRandomSampler(
-                [i for i, seq in enumerate(dataset.sequences) if seq['split'] == 'train']
-            ),
+            sampler=torch.utils.data.SubsetRandomSampler(dataset.split_indices['train']),
             shuffle=False,  # Sampler handles shuffling
             num_workers=0,
             pin_memory=True
@@ -271,9 +266,7 @@ def create_shared_lstm_datasets(data_path: str,
         val_loader = torch.utils.data.DataLoader(
             dataset,
             batch_size=16,  # Use your working batch size
-            sampler=torch.utils.data.SubsetRandomSampler(
-                [i for i, seq in enumerate(dataset.sequences) if seq['split'] == 'val']
-            ),
+            sampler=torch.utils.data.SubsetRandomSampler(dataset.split_indices['val']),
             shuffle=False,  # Sampler handles shuffling
             num_workers=0,
             pin_memory=True
@@ -282,9 +275,7 @@ def create_shared_lstm_datasets(data_path: str,
         test_loader = torch.utils.data.DataLoader(
             dataset,
             batch_size=16,  # Use your working batch size
-            sampler=torch.utils.data.SubsetRandomSampler(
-                [i for i, seq in enumerate(dataset.sequences) if seq['split'] == 'test']
-            ),
+            sampler=torch.utils.data.SubsetRandomSampler(dataset.split_indices['test']),
             shuffle=False,  # Sampler handles shuffling
             num_workers=0,
             pin_memory=True
@@ -469,17 +460,7 @@ def train_shared_lstm_model(model: SharedLSTMModel,
         # Save test metrics
         metrics_path = save_path / "test_metrics.json"
         with open(metrics_path, 'w') as f:
-            # 🔧 FIX: Convert numpy types to Python types for JSON serialization
-            serializable_metrics = {}
-            for key, value in test_metrics.items():
-                if hasattr(value, 'item'):  # numpy scalar
-                    serializable_metrics[key] = value.item()
-                elif isinstance(value, (list, tuple)):
-                    serializable_metrics[key] = [float(v.item()) if hasattr(v, 'item') else v for v in value]
-                else:
-                    serializable_metrics[key] = value
-            
-            json.dump(serializable_metrics, f, indent=2)
+            json.dump(test_metrics, f, indent=2, default=metric_to_json)
         
         # Plot training history
         plot_path = save_path / "training_history.png"
@@ -579,17 +560,7 @@ def train_attention_shared_lstm_model(model: AttentionSharedLSTMModel,
         # Save test metrics
         metrics_path = save_path / "attention_test_metrics.json"
         with open(metrics_path, 'w') as f:
-            # 🔧 FIX: Convert numpy types to Python types for JSON serialization
-            serializable_metrics = {}
-            for key, value in test_metrics.items():
-                if hasattr(value, 'item'):  # numpy scalar
-                    serializable_metrics[key] = value.item()
-                elif isinstance(value, (list, tuple)):
-                    serializable_metrics[key] = [float(v.item()) if hasattr(v, 'item') else v for v in value]
-                else:
-                    serializable_metrics[key] = value
-            
-            json.dump(serializable_metrics, f, indent=2)
+            json.dump(test_metrics, f, indent=2, default=metric_to_json)
         
         # Plot training history
         plot_path = save_path / "attention_training_history.png"
@@ -725,17 +696,7 @@ def evaluate_shared_lstm_model(model_path: str,
         save_path = Path(save_dir)
         metrics_path = save_path / "evaluation_metrics.json"
         with open(metrics_path, 'w') as f:
-            # 🔧 FIX: Convert numpy types to Python types for JSON serialization
-            serializable_metrics = {}
-            for key, value in test_metrics.items():
-                if hasattr(value, 'item'):  # numpy scalar
-                    serializable_metrics[key] = value.item()
-                elif isinstance(value, (list, tuple)):
-                    serializable_metrics[key] = [float(v.item()) if hasattr(v, 'item') else v for v in value]
-                else:
-                    serializable_metrics[key] = value
-            
-            json.dump(serializable_metrics, f, indent=2)
+            json.dump(test_metrics, f, indent=2, default=metric_to_json)
         
         logger.info("Evaluation completed successfully!")
         
@@ -775,6 +736,8 @@ def generate_comprehensive_visualizations(save_dir: str,
     logger.info("Generating comprehensive visualizations")
     
     try:
+        import matplotlib.pyplot as plt
+        
         save_path = Path(save_dir)
         
         # Load the model
@@ -1071,6 +1034,8 @@ def create_spatial_analysis_plots(save_path: Path,
     logger.info("Creating spatial analysis plots...")
     
     try:
+        import matplotlib.pyplot as plt
+        
         # Collect predictions and metadata for spatial analysis
         bin_performance = {}
         
@@ -63,6 +63,13 @@ class EnhancedSharedDataset(Dataset):
         self.val_end_year = val_end_year
         self.test_end_year = test_end_year
         
+        # Per-year model input columns, in feature order: magnitude, frequency,
+        # rolling features per window, then the year feature
+        self.feature_columns = ['max_magnitude', 'frequency']
+        for window in rolling_windows:
+            self.feature_columns += [f'rolling_count_{window}', f'rolling_max_mag_{window}', f'rolling_std_mag_{window}']
+        self.feature_columns.append('year_normalized')
+        
         # Load and preprocess data
         self.raw_data = pd.read_csv(data_path)
         self.logger = logging.getLogger(__name__)
@@ -73,10 +80,19 @@ class EnhancedSharedDataset(Dataset):
         # Prepare sequences with rolling features
         self.sequences = self._prepare_sequences()
         
+        # Index sequences by split once, so split lookups don't rescan the list
+        self.split_indices = {'train': [], 'val': [], 'test': []}
+        for i, seq in enumerate(self.sequences):
+            self.split_indices[seq['split']].append(i)
+        
         # Setup normalization
         if self.normalize:
             self._setup_normalization()
         
+        # Extract and normalize every sequence's feature arrays once, so
+        # __getitem__ doesn't go back through pandas on every epoch
+        self.feature_cache = [self._build_feature_arrays(seq) for seq in self.sequences]
+        
         self.logger.info(f"EnhancedSharedDataset initialized with {len(self.sequences)} sequences")
         self.logger.info(f"Lookback: {lookback_years} years, Target horizon: {target_horizon} years")
         self.logger.info(f"Rolling windows: {rolling_windows}")
@@ -93,11 +109,12 @@ class EnhancedSharedDataset(Dataset):
         if 'frequency' in self.raw_data.columns and 'bin_id' in self.raw_data.columns:
             self.logger.info("Data appears to be pre-processed annual statistics. Using as-is.")
             # Data is already processed, just ensure proper column names and types
-            processed_data = self.raw_data.copy()
+            processed_data = self.raw_data
             
-            # Ensure year column exists and is numeric
+            # Ensure year column exists and is numeric. assign() returns a new
+            # frame, so raw_data stays untouched without a separate full copy
             if 'year' in processed_data.columns:
-                processed_data['year'] = pd.to_numeric(processed_data['year'], errors='coerce')
+                processed_data = processed_data.assign(year=pd.to_numeric(processed_data['year'], errors='coerce'))
             else:
                 self.logger.error("No 'year' column found in processed data")
                 raise ValueError("Processed data must contain 'year' column")
@@ -109,9 +126,9 @@ class EnhancedSharedDataset(Dataset):
             processed_data = processed_data[
                 (processed_data['year'] >= 1910) & 
                 (processed_data['year'] <= 2025)
-            ].copy()
+            ]
             
-            # Sort by bin_id and year
+            # Sort by bin_id and year (sort_values returns a new frame)
             processed_data = processed_data.sort_values(['bin_id', 'year']).reset_index(drop=True)
             
             self.logger.info(f"Using pre-processed data: {len(processed_data)} records, {processed_data['bin_id'].nunique()} bins")
@@ -156,58 +173,45 @@ class EnhancedSharedDataset(Dataset):
         shallow_data['lon_bin'] = pd.cut(shallow_data['E_Long'], bins=lon_bins, labels=False)
         shallow_data['bin_id'] = shallow_data['lat_bin'].astype(str) + '_' + shallow_data['lon_bin'].astype(str)
         
-        # Annual aggregation per bin
-        annual_stats = []
-        
-        for bin_id in shallow_data['bin_id'].unique():
-            bin_data = shallow_data[shallow_data['bin_id'] == bin_id]
-            
-            # Get bin metadata (center coordinates, area)
-            bin_center_lat = bin_data['N_Lat'].mean()
-            bin_center_lon = bin_data['E_Long'].mean()
-            bin_area = (lat_bins[1] - lat_bins[0]) * (lon_bins[1] - lon_bins[0])
-            
-            # Group by year and aggregate
-            yearly = bin_data.groupby('year').agg({
-                'Mag': ['count', 'max'],
-                'Depth': 'mean'
-            }).reset_index()
-            
-            yearly.columns = ['year', 'frequency', 'max_magnitude', 'avg_depth']
-            
-            # Add bin metadata
-            yearly['bin_id'] = bin_id
-            yearly['center_lat'] = bin_center_lat
-            yearly['center_lon'] = bin_center_lon
-            yearly['bin_area'] = bin_area
-            
-            annual_stats.append(yearly)
-        
-        annual_data = pd.concat(annual_stats, ignore_index=True)
-        
-        # Fill missing years with zeros (no earthquakes)
-        complete_years = pd.DataFrame({'year': range(1910, 2026)})
-        complete_data = []
-        
-        for bin_id in annual_data['bin_id'].unique():
-            bin_data = annual_data[annual_data['bin_id'] == bin_id].copy()
-            bin_metadata = bin_data.iloc[0][['bin_id', 'center_lat', 'center_lon', 'bin_area']]
-            
-            # Merge with complete years
-            complete_bin = complete_years.merge(bin_data, on='year', how='left')
-            complete_bin = complete_bin.fillna({
-                'frequency': 0,
-                'max_magnitude': 0,
-                'avg_depth': 0
-            })
-            
-            # Fill metadata
-            for col in ['bin_id', 'center_lat', 'center_lon', 'bin_area']:
-                complete_bin[col] = bin_metadata[col]
-            
-            complete_data.append(complete_bin)
-        
-        final_data = pd.concat(complete_data, ignore_index=True)
+        # Annual aggregation for every bin in one grouped pass instead of
+        # re-scanning the catalog once per bin
+        bin_area = (lat_bins[1] - lat_bins[0]) * (lon_bins[1] - lon_bins[0])
+        
+        annual_data = shallow_data.groupby(['bin_id', 'year']).agg(
+            frequency=('Mag', 'count'),
+            max_magnitude=('Mag', 'max'),
+            avg_depth=('Depth', 'mean')
+        ).reset_index()
+        
+        # Bin center coordinates, attached below. They go through
+        # Series.mean per group so they match the catalog means bit for bit
+        bin_centers = shallow_data.groupby('bin_id').agg(
+            center_lat=('N_Lat', lambda lat: lat.mean()),
+            center_lon=('E_Long', lambda lon: lon.mean())
+        )
+        
+        # Fill missing years with zeros (no earthquakes) by reindexing every bin
+        # onto the full year range at once, rather than merging and
+        # concatenating one frame per bin
+        full_index = pd.MultiIndex.from_product(
+            [annual_data['bin_id'].unique(), range(1910, 2026)],
+            names=['bin_id', 'year']
+        )
+        final_data = annual_data.set_index(['bin_id', 'year']).reindex(full_index)
+        final_data = final_data.fillna({
+            'frequency': 0,
+            'max_magnitude': 0,
+            'avg_depth': 0
+        })
+        
+        # Fill metadata
+        final_data = final_data.reset_index()
+        final_data = final_data.join(bin_centers, on='bin_id')
+        final_data['bin_area'] = bin_area
+        # reindex() keeps the catalog's int32 years when no year is missing
+        final_data['year'] = final_data['year'].astype('int64')
+        final_data = final_data[['year', 'frequency', 'max_magnitude', 'avg_depth',
+                                 'bin_id', 'center_lat', 'center_lon', 'bin_area']]
         final_data = final_data.sort_values(['bin_id', 'year']).reset_index(drop=True)
         
         self.logger.info(f"Created annual aggregates: {len(final_data)} records, {final_data['bin_id'].nunique()} bins")
@@ -215,39 +219,43 @@ class EnhancedSharedDataset(Dataset):
         
         return final_data
     
-    def _add_rolling_features(self, bin_data: pd.DataFrame) -> pd.DataFrame:
+    def _add_rolling_features(self, annual_data: pd.DataFrame) -> pd.DataFrame:
         """
         Add rolling features computed causally (past-only, no leakage).
         
         Args:
-            bin_data: DataFrame for a specific bin, sorted by year
+            annual_data: DataFrame for all bins, sorted by bin_id and year
             
         Returns:
             DataFrame with added rolling features
         """
-        bin_data = bin_data.copy()
+        annual_data = annual_data.copy()
+        
+        # One grouped rolling pass per statistic covers every bin at once;
+        # windows never cross a bin boundary
+        by_bin = annual_data.groupby('bin_id', sort=False)
         
         # Rolling features computed causally (only using past data)
         for window in self.rolling_windows:
             # Rolling count (frequency)
-            bin_data[f'rolling_count_{window}'] = bin_data['frequency'].rolling(
+            annual_data[f'rolling_count_{window}'] = by_bin['frequency'].rolling(
                 window=window, min_periods=1, center=False
-            ).mean()
+            ).mean().to_numpy()
             
             # Rolling max magnitude
-            bin_data[f'rolling_max_mag_{window}'] = bin_data['max_magnitude'].rolling(
+            annual_data[f'rolling_max_mag_{window}'] = by_bin['max_magnitude'].rolling(
                 window=window, min_periods=1, center=False
-            ).max()
+            ).max().to_numpy()
             
             # Rolling std of magnitude
-            bin_data[f'rolling_std_mag_{window}'] = bin_data['max_magnitude'].rolling(
+            annual_data[f'rolling_std_mag_{window}'] = by_bin['max_magnitude'].rolling(
                 window=window, min_periods=1, center=False
-            ).std().fillna(0)
+            ).std().fillna(0).to_numpy()
         
         # Additional features
-        bin_data['year_normalized'] = (bin_data['year'] - 1910) / (2025 - 1910)  # Normalize years
+        annual_data['year_normalized'] = (annual_data['year'] - 1910) / (2025 - 1910)  # Normalize years
         
-        return bin_data
+        return annual_data
     
     def _prepare_sequences(self) -> List[Dict]:
         """
@@ -257,21 +265,35 @@ class EnhancedSharedDataset(Dataset):
             List of sequence dictionaries with split information
         """
         sequences = []
+        split_names = ('train', 'val', 'test')
         
         # 🔧 FIX: Ensure deterministic bin processing order
         bin_ids = sorted(self.annual_data['bin_id'].unique())
         self.logger.info(f"Processing {len(bin_ids)} bins in deterministic order")
         
+        # Add rolling features for all bins in one pass. _create_annual_aggregates
+        # already returns rows sorted by (bin_id, year), so each bin is contiguous
+        # and in year order and the grouped output lines up row-for-row
+        featured_data = self._add_rolling_features(self.annual_data)
+        
+        # Model features are handed to torch as float32 anyway; store them that
+        # way so every sequence slice carries half the bytes
+        featured_data[self.feature_columns] = featured_data[self.feature_columns].astype(np.float32)
+        
         # Group by bin_id
-        for bin_id in bin_ids:
-            bin_data = self.annual_data[self.annual_data['bin_id'] == bin_id].copy()
-            bin_data = bin_data.sort_values('year').reset_index(drop=True)
+        for bin_id, bin_data in featured_data.groupby('bin_id', sort=False):
+            bin_data = bin_data.reset_index(drop=True)
+            n_windows = max(len(bin_data) - self.lookback_years - self.target_horizon + 1, 0)
             
-            # Add rolling features
-            bin_data = self._add_rolling_features(bin_data)
+            # Determine data split based on target year for every window at once:
+            # <= train_end -> 0 (train), <= val_end -> 1 (val), otherwise 2 (test)
+            target_years = bin_data['year'].to_numpy()[self.lookback_years:self.lookback_years + n_windows]
+            split_codes = np.searchsorted(
+                [self.train_end_year, self.val_end_year], target_years, side='left'
+            ).tolist()
             
             # Create sliding windows
-            for i in range(len(bin_data) - self.lookback_years - self.target_horizon + 1):
+            for i in range(n_windows):
                 # Input sequence (lookback years)
                 input_start = i
                 input_end = i + self.lookback_years
@@ -282,15 +304,7 @@ class EnhancedSharedDataset(Dataset):
                 target_end = target_start + self.target_horizon
                 target_sequence = bin_data.iloc[target_start:target_end]
                 
-                # Determine data split based on target year
-                target_year = target_sequence['year'].iloc[0]
-                
-                if target_year <= self.train_end_year:
-                    split = 'train'
-                elif target_year <= self.val_end_year:
-                    split = 'val'
-                else:
-                    split = 'test'
+                split = split_names[split_codes[i]]
                 
                 # Only include if we have complete sequences
                 if len(input_sequence) == self.lookback_years and len(target_sequence) == self.target_horizon:
@@ -470,38 +484,18 @@ class EnhancedSharedDataset(Dataset):
         """Return the number of sequences in the dataset."""
         return len(self.sequences)
     
-    def __getitem__(self, idx: int) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, Dict]:
+    def _build_feature_arrays(self, sequence: Dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
-        Get a sequence from the dataset.
+        Build the normalized model inputs for one sequence.
         
         Args:
-            idx: Index of the sequence
+            sequence: Sequence dictionary from _prepare_sequences
             
         Returns:
-            Tuple of (input_features, target_features, metadata, metadata_dict)
+            Tuple of (input_features, target_features, metadata_features) float32 arrays
         """
-        sequence = self.sequences[idx]
-        
-        # Extract sequential features from input sequence
-        input_features = []
-        for _, row in sequence['input_sequence'].iterrows():
-            features = [
-                row['max_magnitude'],
-                row['frequency']
-            ]
-            
-            # Add rolling features
-            for window in self.rolling_windows:
-                features.extend([
-                    row[f'rolling_count_{window}'],
-                    row[f'rolling_max_mag_{window}'],
-                    row[f'rolling_std_mag_{window}']
-                ])
-            
-            # Add year feature
-            features.append(row['year_normalized'])
-            
-            input_features.append(features)
+        # Extract sequential features from input sequence, one row per year
+        input_features = sequence['input_sequence'][self.feature_columns].to_numpy(dtype=np.float32)
         
         # Extract target features - take the first target year only
         target_row = sequence['target_sequence'].iloc[0]
@@ -538,18 +532,32 @@ class EnhancedSharedDataset(Dataset):
             ]
         
         # Convert to numpy arrays
-        input_features = np.array(input_features, dtype=np.float32)
-        # target_features already created as 2D numpy array above
+        # input_features and target_features already created as numpy arrays above
         metadata_features = np.array(metadata_features, dtype=np.float32)
         
         # Normalize features
         input_features = self._normalize_features(input_features)
         target_features = self._normalize_features(target_features)
         
-        # Convert to tensors
-        input_tensor = torch.FloatTensor(input_features)
-        target_tensor = torch.FloatTensor(target_features)
-        metadata_tensor = torch.FloatTensor(metadata_features)
+        return input_features, target_features, metadata_features
+    
+    def __getitem__(self, idx: int) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, Dict]:
+        """
+        Get a sequence from the dataset.
+        
+        Args:
+            idx: Index of the sequence
+            
+        Returns:
+            Tuple of (input_features, target_features, metadata, metadata_dict)
+        """
+        sequence = self.sequences[idx]
+        input_features, target_features, metadata_features = self.feature_cache[idx]
+        
+        # Convert to tensors (copies, so callers can't modify the cache)
+        input_tensor = torch.tensor(input_features, dtype=torch.float32)
+        target_tensor = torch.tensor(target_features, dtype=torch.float32)
+        metadata_tensor = torch.tensor(metadata_features, dtype=torch.float32)
         
         # Metadata dictionary
         metadata_dict = {
@@ -563,7 +571,7 @@ class EnhancedSharedDataset(Dataset):
     
     def get_split_sequences(self, split: str) -> List[Dict]:
         """Get sequences for a specific split (train/val/test)."""
-        return [seq for seq in self.sequences if seq['split'] == split]
+        return [self.sequences[i] for i in self.split_indices.get(split, [])]
     
     def get_feature_dimensions(self) -> Tuple[int, int, int]:
         """Get input, target, and metadata feature dimensions."""
@@ -60,7 +60,6 @@ import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
 import logging
-import matplotlib.pyplot as plt
 from tqdm import tqdm
 import os
 from pathlib import Path
@@ -304,10 +303,14 @@ class SharedLSTMTrainer:
             frequency_true_normalized = target_seq[:, 1]  # (batch_size,) - frequency (NORMALIZED)
             
             # REFACTOR: Denormalize frequency for loss computation
-            frequency_true = torch.tensor([
-                self.train_loader.dataset.denormalize_single_feature(freq.item(), 'frequency')
-                for freq in frequency_true_normalized
-            ], dtype=torch.float32).to(self.device)
+            # Denormalize the whole batch in one call (float64, as the per-element
+            # Python floats were, then back to float32)
+            frequency_true = torch.tensor(
+                self.train_loader.dataset.denormalize_single_feature(
+                    frequency_true_normalized.detach().cpu().numpy().astype(np.float64), 'frequency'
+                ),
+                dtype=torch.float32
+            ).to(self.device)
             
             # Compute loss
             loss = self.criterion(magnitude_pred.squeeze(), frequency_pred.squeeze(),
@@ -471,10 +474,14 @@ class SharedLSTMTrainer:
                 frequency_true_normalized = target_seq[:, 1]  # (batch_size,) - frequency (NORMALIZED)
                 
                 # 🔧 FIX: Denormalize frequency for Poisson loss using single feature method
-                frequency_true = torch.tensor([
-                    self.val_loader.dataset.denormalize_single_feature(freq.item(), 'frequency')
-                    for freq in frequency_true_normalized
-                ], dtype=torch.float32).to(self.device)
+                # Denormalize the whole batch in one call (float64, as the per-element
+                # Python floats were, then back to float32)
+                frequency_true = torch.tensor(
+                    self.val_loader.dataset.denormalize_single_feature(
+                        frequency_true_normalized.detach().cpu().numpy().astype(np.float64), 'frequency'
+                    ),
+                    dtype=torch.float32
+                ).to(self.device)
                 
                 # 🔧 NEW: Collect raw frequency targets for range analysis
                 all_freq_targets.append(frequency_true.detach().cpu())
@@ -521,10 +528,10 @@ class SharedLSTMTrainer:
             # 🔧 NEW: Denormalize predictions to log1p space for comparison
             if hasattr(self.val_loader.dataset, 'denormalize_frequency_log1p'):
                 # Denormalize predictions back to log1p space
-                freq_preds_log1p = []
-                for pred in freq_preds_cat:
-                    freq_preds_log1p.append(self.val_loader.dataset.denormalize_frequency_log1p(pred.item()))
-                freq_preds_log1p = torch.tensor(freq_preds_log1p)
+                freq_preds_log1p = torch.tensor(
+                    self.val_loader.dataset.denormalize_frequency_log1p(freq_preds_cat.numpy().astype(np.float64)),
+                    dtype=torch.float32
+                )
                 
                 freq_pred_log1p_min, freq_pred_log1p_max = torch.min(freq_preds_log1p).item(), torch.max(freq_preds_log1p).item()
                 freq_target_log1p_min, freq_target_log1p_max = torch.min(freq_targets_log1p_cat).item(), torch.max(freq_targets_log1p_cat).item()
@@ -540,10 +547,10 @@ class SharedLSTMTrainer:
             if self.model.freq_head_type == "linear":
                 # frequency_pred is normalized log1p, denormalize to raw counts
                 if hasattr(self.val_loader.dataset, 'denormalize_frequency_log1p'):
-                    freq_preds_raw = []
-                    for pred in freq_preds_cat:
-                        freq_preds_raw.append(self.val_loader.dataset.denormalize_frequency_log1p(pred.item()))
-                    freq_preds_raw = torch.tensor(freq_preds_raw)
+                    freq_preds_raw = torch.tensor(
+                        self.val_loader.dataset.denormalize_frequency_log1p(freq_preds_cat.numpy().astype(np.float64)),
+                        dtype=torch.float32
+                    )
                 else:
                     # Fallback: frequency_pred is log(λ), so λ = exp(frequency_pred)
                     freq_preds_raw = torch.exp(freq_preds_cat)
@@ -710,10 +717,14 @@ class SharedLSTMTrainer:
                 frequency_true_normalized = target_seq[:, 1]  # (batch_size,) - frequency (NORMALIZED)
                 
                 # 🔧 FIX: Denormalize frequency for Poisson loss using single feature method
-                frequency_true = torch.tensor([
-                    data_loader.dataset.denormalize_single_feature(freq.item(), 'frequency')
-                    for freq in frequency_true_normalized
-                ], dtype=torch.float32).to(self.device)
+                # Denormalize the whole batch in one call (float64, as the per-element
+                # Python floats were, then back to float32)
+                frequency_true = torch.tensor(
+                    data_loader.dataset.denormalize_single_feature(
+                        frequency_true_normalized.detach().cpu().numpy().astype(np.float64), 'frequency'
+                    ),
+                    dtype=torch.float32
+                ).to(self.device)
                 
                 # Compute loss
                 loss = self.criterion(magnitude_pred.squeeze(), frequency_pred.squeeze(),
@@ -768,10 +779,9 @@ class SharedLSTMTrainer:
         if self.model.freq_head_type == "linear":
             # frequency_predictions are in normalized log1p space, denormalize to raw counts
             if hasattr(self.test_loader.dataset, 'denormalize_frequency_log1p'):
-                frequency_raw_predictions = []
-                for pred in frequency_predictions:
-                    frequency_raw_predictions.append(self.test_loader.dataset.denormalize_frequency_log1p(pred))
-                frequency_raw_predictions = np.array(frequency_raw_predictions)
+                frequency_raw_predictions = self.test_loader.dataset.denormalize_frequency_log1p(
+                    frequency_predictions.astype(np.float64)
+                )
             else:
                 # Fallback: frequency_predictions are in log(λ) space, convert to raw counts using exp()
                 frequency_raw_predictions = np.exp(frequency_predictions)
@@ -789,10 +799,9 @@ class SharedLSTMTrainer:
         
         # Show denormalized log1p ranges if available
         if hasattr(self.test_loader.dataset, 'denormalize_frequency_log1p'):
-            freq_log1p_preds = []
-            for pred in frequency_predictions:
-                freq_log1p_preds.append(self.test_loader.dataset.denormalize_frequency_log1p(pred))
-            freq_log1p_preds = np.array(freq_log1p_preds)
+            freq_log1p_preds = self.test_loader.dataset.denormalize_frequency_log1p(
+                frequency_predictions.astype(np.float64)
+            )
             freq_log1p_min, freq_log1p_max = np.min(freq_log1p_preds), np.max(freq_log1p_preds)
             self.logger.info(f"Freq denorm log1p preds [{freq_log1p_min:.2f},{freq_log1p_max:.2f}], targets [{freq_true_min:.1f},{freq_true_max:.1f}]")
         
@@ -1057,6 +1066,8 @@ class SharedLSTMTrainer:
     
     def plot_training_history(self, save_path: Optional[str] = None):
         """Plot training history with enhanced metrics."""
+        import matplotlib.pyplot as plt
+
         # 🔧 IMPROVEMENT: Create a larger figure to accommodate all metrics
         fig, axes = plt.subplots(3, 3, figsize=(18, 15))
         
@@ -19,6 +19,18 @@ from pathlib import Path
 from binning.quadtree import QuadtreeBinner
 
 
+# Column mapping for different naming conventions
+COLUMN_MAPPING = {
+    'depth': ('depth', 'Depth', 'DEPTH'),
+    'latitude': ('latitude', 'lat', 'Lat', 'LAT', 'N_Lat'),
+    'longitude': ('longitude', 'lon', 'Lon', 'LON', 'E_Long'),
+    'magnitude': ('magnitude', 'mag', 'Mag', 'MAG'),
+    'year': ('year', 'Year', 'YEAR'),
+    'month': ('month', 'Month', 'MONTH'),
+    'day': ('day', 'Day', 'DAY')
+}
+
+
 class EarthquakeProcessor:
     """
     Earthquake data processor implementing the methodology from the paper.
@@ -47,16 +59,8 @@ class EarthquakeProcessor:
         )
         self.logger = logging.getLogger(__name__)
         
-        # Column mapping for different naming conventions
-        self.column_mapping = {
-            'depth': ['depth', 'Depth', 'DEPTH'],
-            'latitude': ['latitude', 'lat', 'Lat', 'LAT', 'N_Lat'],
-            'longitude': ['longitude', 'lon', 'Lon', 'LON', 'E_Long'],
-            'magnitude': ['magnitude', 'mag', 'Mag', 'MAG', 'Mag'],
-            'year': ['year', 'Year', 'YEAR'],
-            'month': ['month', 'Month', 'MONTH'],
-            'day': ['day', 'Day', 'DAY']
-        }
+        # Column mapping for different naming conventions (shared, read-only)
+        self.column_mapping = COLUMN_MAPPING
     
     def _get_column_name(self, df: pd.DataFrame, target_col: str) -> str:
         """
@@ -164,18 +168,14 @@ class EarthquakeProcessor:
         mag_col = self._get_column_name(df, 'magnitude')
         depth_col = self._get_column_name(df, 'depth')
         
-        # Group by year and bin_id, compute statistics
-        annual_stats = df.groupby(['year', 'bin_id']).agg({
-            mag_col: ['max', 'mean'],
-            depth_col: 'mean'
-        }).reset_index()
-        
-        # Flatten column names
-        annual_stats.columns = ['year', 'bin_id', 'max_magnitude', 'avg_magnitude', 'avg_depth']
-        
-        # Add frequency (count of earthquakes per year per bin)
-        frequency = df.groupby(['year', 'bin_id']).size().reset_index(name='frequency')
-        annual_stats = annual_stats.merge(frequency, on=['year', 'bin_id'])
+        # Group by year and bin_id, compute statistics and frequency (count of
+        # earthquakes per year per bin) in a single pass
+        annual_stats = df.groupby(['year', 'bin_id']).agg(
+            max_magnitude=(mag_col, 'max'),
+            avg_magnitude=(mag_col, 'mean'),
+            avg_depth=(depth_col, 'mean'),
+            frequency=(mag_col, 'size')
+        ).reset_index()
         
         # Sort by year and bin_id
         annual_stats = annual_stats.sort_values(['year', 'bin_id']).reset_index(drop=True)
@@ -208,58 +208,33 @@ class EarthquakeProcessor:
         unique_bins = annual_stats['bin_id'].unique()
         
         # Create complete year-bin combinations
-        all_years = list(range(min_year, max_year + 1))
-        filled_data = []
+        all_years = np.arange(min_year, max_year + 1)
+        full_index = pd.MultiIndex.from_product([unique_bins, all_years], names=['bin_id', 'year'])
+        
+        # For every (bin, year) find the last actual row at or before it
+        actual = annual_stats.sort_values(['bin_id', 'year']).reset_index(drop=True)
+        row_pos = pd.Series(
+            np.arange(len(actual)), index=pd.MultiIndex.from_frame(actual[['bin_id', 'year']])
+        ).reindex(full_index)
+        observed = row_pos.notna().to_numpy()
+        last_pos = row_pos.groupby(level='bin_id', sort=False).ffill()
+        has_previous = last_pos.notna().to_numpy()
+        
+        # Years that exist use actual data; missing years copy the last
+        # available values (forward-fill) with the year updated. Every column
+        # comes out float, as the old row-by-row construction produced.
+        filled_df = actual.iloc[last_pos.fillna(0).to_numpy(dtype=int)].astype(float).reset_index(drop=True)
+        filled_df['year'] = full_index.get_level_values('year').to_numpy(dtype=float)
+        filled_df['bin_id'] = full_index.get_level_values('bin_id').to_numpy(dtype=float)
+        
+        # Apply zero-filling logic from paper:
+        # "zero values were filled with a value equal to the last non-zero value"
+        # Only fill if the last value was non-zero for frequency; otherwise
+        # (or with no previous data) create a minimal entry
+        minimal = ~observed & ~(has_previous & (filled_df['frequency'].to_numpy() > 0))
+        filled_df.loc[minimal, ['max_magnitude', 'avg_magnitude', 'frequency']] = 0.0
+        filled_df.loc[minimal & ~has_previous, 'avg_depth'] = 10.0  # Default shallow depth
         
-        for bin_id in unique_bins:
-            bin_data = annual_stats[annual_stats['bin_id'] == bin_id].copy()
-            bin_data = bin_data.sort_values('year').reset_index(drop=True)
-            
-            # Create complete timeline for this bin
-            for year in all_years:
-                existing_row = bin_data[bin_data['year'] == year]
-                
-                if not existing_row.empty:
-                    # Year exists, use actual data
-                    filled_data.append(existing_row.iloc[0].to_dict())
-                else:
-                    # Year missing, need to fill
-                    # Find the last non-zero value before this year
-                    previous_data = bin_data[bin_data['year'] < year]
-                    
-                    if not previous_data.empty:
-                        # Use forward-fill: copy the last available values
-                        last_row = previous_data.iloc[-1].to_dict()
-                        last_row['year'] = year  # Update year to current
-                        
-                        # Apply zero-filling logic from paper:
-                        # "zero values were filled with a value equal to the last non-zero value"
-                        # Only fill if the last value was non-zero for frequency
-                        if last_row.get('frequency', 0) > 0:
-                            filled_data.append(last_row)
-                        else:
-                            # If last value was also zero, create minimal entry
-                            filled_data.append({
-                                'year': year,
-                                'bin_id': bin_id,
-                                'max_magnitude': 0.0,
-                                'avg_magnitude': 0.0,
-                                'avg_depth': last_row.get('avg_depth', 10.0),  # Use reasonable default
-                                'frequency': 0
-                            })
-                    else:
-                        # No previous data available, create minimal entry
-                        filled_data.append({
-                            'year': year,
-                            'bin_id': bin_id,
-                            'max_magnitude': 0.0,
-                            'avg_magnitude': 0.0,
-                            'avg_depth': 10.0,  # Default shallow depth
-                            'frequency': 0
-                        })
-        
-        # Convert back to DataFrame
-        filled_df = pd.DataFrame(filled_data)
         filled_df = filled_df.sort_values(['year', 'bin_id']).reset_index(drop=True)
         
         original_rows = len(annual_stats)
@@ -272,6 +247,9 @@ class EarthquakeProcessor:
         """
         Prepare data for LSTM training with sliding window approach.
         
+        Nested view of prepare_lstm_frame: one record per window, holding its
+        lookback years as a list of per-year dicts plus the target year.
+        
         Args:
             annual_stats: DataFrame with annual statistics per bin
             lookback_years: Number of years to look back (default: 10)
@@ -279,48 +257,90 @@ class EarthquakeProcessor:
         Returns:
             DataFrame ready for LSTM training
         """
+        lstm_frame = self.prepare_lstm_frame(annual_stats, lookback_years)
+        
+        # prepare_lstm_frame emits lookback_years consecutive rows per window
+        bin_ids = lstm_frame['bin_id'].to_numpy()
+        inputs = lstm_frame[['year', 'max_magnitude', 'frequency']].to_numpy()
+        targets = lstm_frame[['target_year', 'target_max_magnitude', 'target_frequency']].to_numpy()
+        
+        lstm_data = []
+        for start in range(0, len(lstm_frame), lookback_years):
+            bin_id = bin_ids[start]
+            sequence_features = [
+                {
+                    'bin_id': bin_id,
+                    'year': year,
+                    'max_magnitude': max_magnitude,
+                    'frequency': frequency
+                }
+                for year, max_magnitude, frequency in inputs[start:start + lookback_years]
+            ]
+            target_year, target_max_magnitude, target_frequency = targets[start]
+            
+            lstm_data.append({
+                'bin_id': bin_id,
+                'input_sequence': sequence_features,
+                'target_year': target_year,
+                'target_max_magnitude': target_max_magnitude,
+                'target_frequency': target_frequency
+            })
+        
+        return lstm_data
+    
+    def prepare_lstm_frame(self, annual_stats: pd.DataFrame, lookback_years: int = 10) -> pd.DataFrame:
+        """
+        Prepare flat data for LSTM training with sliding window approach.
+        
+        Produces one row per (window, lookback year) with the window's target
+        repeated, building each column as a NumPy array.
+        
+        Args:
+            annual_stats: DataFrame with annual statistics per bin
+            lookback_years: Number of years to look back (default: 10)
+            
+        Returns:
+            DataFrame with bin_id, year, max_magnitude, frequency and target_* columns
+        """
         self.logger.info(f"Preparing LSTM data with {lookback_years}-year lookback")
         
         # Get unique bins
         unique_bins = annual_stats['bin_id'].unique()
         self.logger.info(f"Preparing data for {len(unique_bins)} quadtree bins")
         
-        lstm_data = []
+        columns = ['year', 'max_magnitude', 'frequency',
+                   'target_year', 'target_max_magnitude', 'target_frequency']
+        bin_chunks = []
+        chunks = []
+        n_samples = 0
         
         for bin_id in unique_bins:
-            bin_data = annual_stats[annual_stats['bin_id'] == bin_id].copy()
-            bin_data = bin_data.sort_values('year').reset_index(drop=True)
-            
-            # Create sliding windows
-            for i in range(len(bin_data) - lookback_years):
-                # Input sequence (lookback years)
-                input_sequence = bin_data.iloc[i:i+lookback_years]
-                
-                # Target (next year)
-                target = bin_data.iloc[i+lookback_years]
-                
-                # Create features for each year in sequence
-                sequence_features = []
-                for _, row in input_sequence.iterrows():
-                    features = {
-                        'bin_id': bin_id,
-                        'year': row['year'],
-                        'max_magnitude': row['max_magnitude'],
-                        'frequency': row['frequency']
-                    }
-                    sequence_features.append(features)
-                
-                # Add target information
-                lstm_data.append({
-                    'bin_id': bin_id,
-                    'input_sequence': sequence_features,
-                    'target_year': target['year'],
-                    'target_max_magnitude': target['max_magnitude'],
-                    'target_frequency': target['frequency']
-                })
-        
-        self.logger.info(f"Created {len(lstm_data)} LSTM training samples")
-        return lstm_data
+            bin_data = annual_stats[annual_stats['bin_id'] == bin_id].sort_values('year')
+            rows = bin_data[['year', 'max_magnitude', 'frequency']].to_numpy(dtype=float)
+            
+            n_windows = len(rows) - lookback_years
+            if n_windows <= 0:
+                continue
+            n_samples += n_windows
+            
+            # Row indices of every window's lookback years, and of its target year
+            input_idx = (np.arange(n_windows)[:, None] + np.arange(lookback_years)).ravel()
+            target_idx = np.repeat(np.arange(n_windows) + lookback_years, lookback_years)
+            
+            chunk = np.empty((len(input_idx), len(columns)))
+            chunk[:, 0:3] = rows[input_idx]
+            chunk[:, 3:6] = rows[target_idx]
+            chunks.append(chunk)
+            # bin_id keeps the dtype it has in annual_stats
+            bin_chunks.append(np.repeat(bin_data['bin_id'].to_numpy()[:1], len(input_idx)))
+        
+        self.logger.info(f"Created {n_samples} LSTM training samples")
+        
+        values = np.concatenate(chunks) if chunks else np.empty((0, len(columns)))
+        lstm_frame = pd.DataFrame(values, columns=columns)
+        bin_values = np.concatenate(bin_chunks) if bin_chunks else annual_stats['bin_id'].to_numpy()[:0]
+        lstm_frame.insert(0, 'bin_id', bin_values)
+        return lstm_frame
     
     def process_catalog(self, df: pd.DataFrame, save_path: str = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
@@ -378,7 +398,9 @@ class EarthquakeProcessor:
         Returns:
             DataFrame with standardized column names
         """
-        df_std = df.copy()
+        # The frame is owned by the processing pipeline, so there is no need to
+        # copy it up front: rename() already returns a new frame when it renames
+        df_std = df
         
         # Map original column names to standard names
         column_mapping = {}
@@ -434,25 +456,10 @@ class EarthquakeProcessor:
         annual_stats.to_csv(stats_path, index=False)
         self.logger.info(f"Saved annual statistics to: {stats_path}")
         
-        # Save LSTM-ready data
-        lstm_data = self.prepare_lstm_data(annual_stats)
+        # Save LSTM-ready data, built column-wise without the nested per-window dicts
+        lstm_df = self.prepare_lstm_frame(annual_stats)
         lstm_path = catalog_path.parent / f"{catalog_path.stem}_lstm_ready.csv"
         
-        # Convert LSTM data to DataFrame format
-        lstm_df = []
-        for item in lstm_data:
-            for seq_item in item['input_sequence']:
-                lstm_df.append({
-                    'bin_id': seq_item['bin_id'],
-                    'year': seq_item['year'],
-                    'max_magnitude': seq_item['max_magnitude'],
-                    'frequency': seq_item['frequency'],
-                    'target_year': item['target_year'],
-                    'target_max_magnitude': item['target_max_magnitude'],
-                    'target_frequency': item['target_frequency']
-                })
-        
-        lstm_df = pd.DataFrame(lstm_df)
         lstm_df.to_csv(lstm_path, index=False)
         self.logger.info(f"Saved LSTM-ready data to: {lstm_path}")
     
@@ -1,6 +1,5 @@
 import pandas as pd
 from csep.core.catalogs import CSEPCatalog
-from csep.utils.time_utils import datetime_to_utc_epoch
 
 def load_catalog(filepath):
   
@@ -29,8 +28,13 @@ def load_catalog(filepath):
         'Asia/Manila', ambiguous='NaT', nonexistent='NaT'
     ).dt.tz_convert('UTC')
 
-    #  CONVERT UTC TO EPOCH TIME
-    df['origin_time'] = df['Date_Time'].apply(datetime_to_utc_epoch)
+    #  CONVERT UTC TO EPOCH TIME (MILLISECONDS)
+    #  Vectorised form of csep's datetime_to_utc_epoch: whole seconds plus
+    #  microseconds, scaled to ms and truncated, so the values match exactly
+    since_epoch = df['Date_Time'] - pd.Timestamp(0, tz='UTC')
+    whole_seconds = since_epoch // pd.Timedelta(seconds=1)
+    microseconds = (since_epoch % pd.Timedelta(seconds=1)) // pd.Timedelta(microseconds=1)
+    df['origin_time'] = (1000.0 * (whole_seconds + microseconds / 1e6)).astype('int64')
 
     #  ADD ID COL
     df = df.reset_index().rename(columns={'index': 'id'})